@@ -0,0 +1,149 @@
+"""
+AMDORO.RO - Local Cache
+Cache L1 în procesul API-ului (în fața Redis): LRU cu dimensiune limitată,
+TTL per namespace, single-flight la miss și statistici de hit rate
+"""
+
+import asyncio
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Tuple
+
+# Rezultatul unei căutări în L1 fără valoare
+MISSING = object()
+
+
+def cache_namespace(key: str) -> str:
+    """Namespace-ul unei chei ("product:iphone-15" -> "product")"""
+    return key.split(':', 1)[0]
+
+
+class LocalCache:
+    """
+    Cache LRU per proces, cu invalidare pe tag-uri
+
+    TTL-urile L1 sunt scurte: intrările pot fi invalidate și din alt proces, iar
+    mesajele de invalidare ajung la fiecare worker (evict_tags). Un miss pe o
+    cheie aflată deja în lucru așteaptă rezultatul aceluiași loader.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttls: Dict[str, float] = None,
+                 default_ttl: float = 5):
+        """
+        Args:
+            max_entries: intrări păstrate (cele mai vechi folosite sunt evacuate)
+            ttls: namespace -> TTL în secunde
+            default_ttl: TTL pentru namespace-urile nelistate
+        """
+        self.max_entries = max_entries
+        self.ttls = ttls or {}
+        self.default_ttl = default_ttl
+        # cheie -> (expiră la, valoare, tag-uri)
+        self._entries: "OrderedDict[str, Tuple[float, Any, Tuple[str, ...]]]" = OrderedDict()
+        # tag -> cheile L1 care depind de el
+        self._tags: Dict[str, set] = defaultdict(set)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # namespace -> contoare (l1_hits, l2_hits, misses, coalesced)
+        self._stats: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+    def get(self, key: str) -> Any:
+        """Valoarea din L1 sau MISSING (intrările expirate sunt șterse)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return MISSING
+        if entry[0] <= time.monotonic():
+            self.evict(key)
+            return MISSING
+
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def set(self, key: str, value: Any, tags: Iterable[str] = ()):
+        """Adaugă / înlocuiește o intrare (TTL-ul vine din namespace-ul cheii)"""
+        self.evict(key)
+
+        tags = tuple(tags)
+        ttl = self.ttls.get(cache_namespace(key), self.default_ttl)
+        self._entries[key] = (time.monotonic() + ttl, value, tags)
+        for tag in tags:
+            self._tags[tag].add(key)
+
+        while len(self._entries) > self.max_entries:
+            self.evict(next(iter(self._entries)))
+
+    def evict(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def evict_tags(self, tags: Iterable[str]) -> int:
+        """Șterge intrările care depind de tag-urile date; întoarce numărul lor"""
+        keys = set()
+        for tag in tags:
+            keys.update(self._tags.get(tag, ()))
+        for key in keys:
+            self.evict(key)
+        return len(keys)
+
+    def record(self, key: str, outcome: str):
+        """Contorizează un rezultat: 'l1_hits', 'l2_hits', 'misses' sau 'coalesced'"""
+        self._stats[cache_namespace(key)][outcome] += 1
+
+    async def single_flight(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Rulează loader() o singură dată per cheie: cererile concurente pentru
+        aceeași cheie așteaptă rezultatul (sau excepția) primului apel
+        """
+        future = self._inflight.get(key)
+        if future is not None:
+            self.record(key, 'coalesced')
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # A fost anulată cererea care încărca cheia, nu aceasta: reîncearcă
+                if future.cancelled() and not asyncio.current_task().cancelling():
+                    return await self.single_flight(key, loader)
+                raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Excepția e consumată aici dacă nu a așteptat nimeni
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            del self._inflight[key]
+
+    def stats(self) -> Dict:
+        """Hit rate L1 / L2 per namespace + ocuparea cache-ului"""
+        namespaces = {}
+        for namespace, counters in sorted(self._stats.items()):
+            lookups = counters['l1_hits'] + counters['l2_hits'] + counters['misses'] + counters['coalesced']
+            namespaces[namespace] = {
+                **counters,
+                'lookups': lookups,
+                'l1_hit_rate': round(counters['l1_hits'] / lookups, 4) if lookups else None,
+                'l2_hit_rate': round(counters['l2_hits'] / lookups, 4) if lookups else None,
+            }
+
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'inflight': len(self._inflight),
+            'namespaces': namespaces,
+        }
@@ -91,8 +91,16 @@ CREATE TABLE products (
     -- Managementul ciclului de viață
     is_active BOOLEAN DEFAULT true,
     feed_last_seen TIMESTAMP DEFAULT CURRENT_TIMESTAMP, -- Ultima dată când a apărut în feed
+    content_hash CHAR(32), -- Fingerprint MD5 al datelor normalizate din feed (skip update la re-import)
     status VARCHAR(50) DEFAULT 'active', -- 'active', 'discontinued', 'out_of_stock_30d'
     
+    -- Full-text: vector ponderat calculat la scriere (titlu A, brand/model B, descriere C)
+    search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('romanian', COALESCE(title, '')), 'A') ||
+        setweight(to_tsvector('romanian', COALESCE(brand, '') || ' ' || COALESCE(model, '')), 'B') ||
+        setweight(to_tsvector('romanian', COALESCE(description, '')), 'C')
+    ) STORED,
+    
     -- Timestamps
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -105,15 +113,8 @@ CREATE TABLE products (
 -- INDEXURI CRITICE pentru performanță <200ms
 -- ============================================
 
--- Index compus pentru căutări full-text
-CREATE INDEX idx_products_search ON products USING GIN(
-    to_tsvector('romanian', 
-        COALESCE(title, '') || ' ' || 
-        COALESCE(brand, '') || ' ' || 
-        COALESCE(model, '') || ' ' ||
-        COALESCE(description, '')
-    )
-);
+-- Index pentru căutări full-text (filtrarea și ts_rank folosesc aceeași coloană)
+CREATE INDEX idx_products_search_vector ON products USING GIN(search_vector);
 
 -- Index pentru filtrare după categorie + preț
 CREATE INDEX idx_products_category_price ON products(category_id, price_cents) 
@@ -217,6 +218,53 @@ CREATE TABLE sitemap_entries (
 CREATE INDEX idx_sitemap_type_priority ON sitemap_entries(url_type, priority DESC);
 CREATE INDEX idx_sitemap_file ON sitemap_entries(sitemap_file) WHERE in_sitemap = true;
 
+-- ============================================
+-- 6b. STAGING IMPORT (FeedImporter cu staged_merge)
+-- ============================================
+-- UNLOGGED: fără WAL la încărcare; conținutul e temporar (golit după fiecare merge)
+-- Prețurile și comisionul rămân text până la validarea din merge
+CREATE UNLOGGED TABLE products_staging (
+    import_run VARCHAR(100) NOT NULL, -- '{feed_source}:{id rulare}'
+    row_number INTEGER NOT NULL, -- poziția în feed (ultima apariție câștigă)
+    feed_product_id TEXT,
+    feed_source VARCHAR(50),
+    title TEXT,
+    slug TEXT,
+    brand TEXT,
+    model TEXT,
+    ean TEXT,
+    category_id INTEGER,
+    feed_category_original TEXT,
+    price_cents TEXT,
+    old_price_cents TEXT,
+    description TEXT,
+    description_enriched TEXT,
+    image_url TEXT,
+    affiliate_link TEXT,
+    affiliate_network TEXT,
+    commission_percent TEXT,
+    in_stock BOOLEAN,
+    stock_status TEXT,
+    indexation_priority SMALLINT,
+    content_hash CHAR(32),
+    reject_reason VARCHAR(50) -- setat la validare; NULL = rând valid
+);
+
+CREATE INDEX idx_products_staging_run ON products_staging(import_run, feed_product_id);
+
+-- Rânduri respinse la merge (nu anulează restul feed-ului)
+CREATE TABLE import_quarantine (
+    id BIGSERIAL PRIMARY KEY,
+    import_run VARCHAR(100) NOT NULL,
+    feed_source VARCHAR(50) NOT NULL,
+    feed_product_id TEXT,
+    reason VARCHAR(50) NOT NULL, -- 'invalid_price', 'slug_conflict', 'missing_feed_id', ...
+    payload JSONB, -- rândul normalizat, pentru review
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX idx_import_quarantine_source ON import_quarantine(feed_source, created_at DESC);
+
 -- ============================================
 -- 7. VIEW pentru căutări rapide
 -- ============================================
@@ -226,30 +274,51 @@ SELECT
     p.slug,
     p.title,
     p.brand,
+    p.model,
     p.price_cents,
-    p.discount_percent,
+    p.old_price_cents,
+    COALESCE(p.discount_percent, 0) as discount_percent,
     p.image_url,
+    p.affiliate_link,
     p.in_stock,
+    p.stock_status,
+    p.category_id,
     c.slug as category_slug,
     c.name as category_name,
-    p.views_count,
-    p.clicks_count,
-    to_tsvector('romanian', 
-        COALESCE(p.title, '') || ' ' || 
-        COALESCE(p.brand, '') || ' ' || 
-        COALESCE(p.model, '') || ' ' ||
-        COALESCE(p.description, '')
-    ) as search_vector
+    -- Cheile de sortare fără NULL (paginarea cu cursor compară tupluri)
+    COALESCE(p.views_count, 0) as views_count,
+    COALESCE(p.clicks_count, 0) as clicks_count,
+    COALESCE(p.indexation_priority, 5) as indexation_priority,
+    p.created_at,
+    p.search_vector
 FROM products p
 LEFT JOIN categories c ON p.category_id = c.id
 WHERE p.is_active = true;
 
 -- Index pentru search view
+-- (indexul unic e necesar pentru REFRESH ... CONCURRENTLY)
+CREATE UNIQUE INDEX idx_products_search_view_id ON products_search_view(id);
 CREATE INDEX idx_products_search_view_vector ON products_search_view USING GIN(search_vector);
-CREATE INDEX idx_products_search_view_category ON products_search_view(category_slug);
 
--- Refresh automat al view-ului (executat periodic)
+-- Categorie + cheile fiecărei sortări (+ id): pagina următoare e un seek în index
+-- (scanat invers pentru sortările DESC), nu sort + OFFSET
+CREATE INDEX idx_products_search_view_relevant ON products_search_view(category_slug, indexation_priority, views_count, id);
+CREATE INDEX idx_products_search_view_price ON products_search_view(category_slug, price_cents, id);
+CREATE INDEX idx_products_search_view_newest ON products_search_view(category_slug, created_at, id);
+CREATE INDEX idx_products_search_view_popular ON products_search_view(category_slug, views_count, clicks_count, id);
+CREATE INDEX idx_products_search_view_discount ON products_search_view(category_slug, discount_percent, id);
+
+-- Refresh-ul e făcut de import la finalul rulării (FeedImporter.refresh_search_view):
 -- REFRESH MATERIALIZED VIEW CONCURRENTLY products_search_view;
+CREATE TABLE materialized_view_refreshes (
+    view_name VARCHAR(100) PRIMARY KEY,
+    requested_at TIMESTAMP, -- ultima cerere de refresh (import cu produse modificate)
+    refreshed_at TIMESTAMP, -- începutul ultimului refresh reușit: datele sunt la zi până aici
+    duration_ms INTEGER
+);
+
+INSERT INTO materialized_view_refreshes (view_name, refreshed_at)
+VALUES ('products_search_view', CURRENT_TIMESTAMP);
 
 -- ============================================
 -- 8. FUNCȚIE pentru actualizare automate
@@ -265,8 +334,12 @@ END;
 $$ language 'plpgsql';
 
 -- Aplicare trigger pe tabele
+-- Touch-ul feed_last_seen pentru produse neschimbate la re-import nu modifică updated_at
 CREATE TRIGGER update_products_updated_at BEFORE UPDATE ON products
-    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+    FOR EACH ROW
+    WHEN (OLD.feed_last_seen IS NOT DISTINCT FROM NEW.feed_last_seen
+          OR OLD.content_hash IS DISTINCT FROM NEW.content_hash)
+    EXECUTE FUNCTION update_updated_at_column();
 
 CREATE TRIGGER update_categories_updated_at BEFORE UPDATE ON categories
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
@@ -284,7 +357,8 @@ BEGIN
 END;
 $$ language 'plpgsql';
 
-CREATE TRIGGER calculate_product_discount BEFORE INSERT OR UPDATE ON products
+-- Doar la schimbări de preț (nu la touch-ul feed_last_seen din import)
+CREATE TRIGGER calculate_product_discount BEFORE INSERT OR UPDATE OF price_cents, old_price_cents ON products
     FOR EACH ROW EXECUTE FUNCTION calculate_discount();
 
 -- ============================================
@@ -341,3 +415,32 @@ LIMIT 36;
 
 -- Reindex pentru performanță
 -- REINDEX TABLE products;
+
+-- Migrare baze existente: fingerprint pentru re-import incremental
+-- ALTER TABLE products ADD COLUMN IF NOT EXISTS content_hash CHAR(32);
+
+-- Migrare baze existente: import din staging (vezi secțiunea 6b)
+-- CREATE UNLOGGED TABLE products_staging (...); CREATE TABLE import_quarantine (...);
+
+-- Migrare baze existente: refresh gestionat pentru products_search_view (secțiunea 7)
+-- DROP MATERIALIZED VIEW products_search_view; apoi CREATE MATERIALIZED VIEW + indexuri din secțiunea 7
+-- CREATE TABLE materialized_view_refreshes (...); INSERT INTO materialized_view_refreshes ...
+
+-- Migrare baze existente: vector full-text stocat și ponderat (rescrie tabela products)
+-- ALTER TABLE products ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (...) STORED; -- expresia din secțiunea 2
+-- CREATE INDEX CONCURRENTLY idx_products_search_vector ON products USING GIN(search_vector);
+-- DROP INDEX CONCURRENTLY idx_products_search;
+-- apoi recrearea products_search_view (secțiunea 7)
+
+-- Migrare baze existente: paginare cu cursor (secțiunea 7)
+-- recrearea products_search_view cu cheile de sortare COALESCE + indexurile idx_products_search_view_*
+-- (idx_products_search_view_category e înlocuit de indexurile compuse)
+
+-- Migrare baze existente: fațete în search (products_search_view expune stock_status)
+-- recrearea products_search_view (secțiunea 7)
+
+-- Migrare baze existente: brandul recunoscut din titlu (BrandRecognizer)
+-- brand e rescris la re-import doar de când face parte din PRODUCT_UPDATE_COLUMNS;
+-- produsele importate înainte păstrează brandul din primul cuvânt al titlului.
+-- Hash-ul golit forțează rescrierea lor completă la următorul import:
+-- UPDATE products SET content_hash = NULL WHERE content_hash IS NOT NULL;
@@ -0,0 +1,85 @@
+"""
+AMDORO.RO - Brand Recognizer
+Recunoașterea brandului din titlul produsului: index pe token-uri normalizate
+și n-grame (ex. "hewlett packard"), construit o singură dată per import
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from unidecode import unidecode
+
+# Cuvinte alfanumerice; '&' e token separat ("H&M" -> h & m)
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+|&')
+
+
+def tokenize(text: str) -> Tuple[str, ...]:
+    """Token-uri normalizate: lowercase, fără diacritice, fără punctuație"""
+    return tuple(TOKEN_PATTERN.findall(unidecode(text or '').lower()))
+
+
+class BrandRecognizer:
+    """
+    Dicționar de branduri indexat pe secvențe de token-uri
+
+    Un brand e găsit doar ca secvență completă de cuvinte ("HP" nu apare în
+    "SHPOCKET"). Căutarea face câteva probe în dict per poziție din titlu;
+    la aceeași poziție câștigă varianta cea mai lungă.
+    """
+
+    def __init__(self, brands: Iterable[str], aliases: Optional[Dict[str, List[str]]] = None,
+                 top_brands: Iterable[str] = ()):
+        """
+        Args:
+            brands: numele canonice (tabela brands + knownBrands din config)
+            aliases: brand canonic -> alte scrieri (config/brand-aliases.json)
+            top_brands: branduri care primesc boost la prioritatea de indexare
+        """
+        # secvență de token-uri -> nume canonic
+        self._index: Dict[Tuple[str, ...], str] = {}
+        # primul token -> lungimile variantelor care încep cu el (descrescător)
+        self._lengths: Dict[str, List[int]] = {}
+
+        for brand in brands:
+            self.add(brand, brand)
+        for brand, variants in (aliases or {}).items():
+            self.add(brand, brand)
+            for variant in variants:
+                self.add(variant, brand)
+
+        self._top = {tokenize(brand) for brand in top_brands}
+
+    def add(self, variant: str, brand: str):
+        """Înregistrează o scriere a unui brand (prima înregistrare câștigă)"""
+        tokens = tokenize(variant)
+        if not tokens or tokens in self._index:
+            return
+
+        self._index[tokens] = brand
+        lengths = self._lengths.setdefault(tokens[0], [])
+        if len(tokens) not in lengths:
+            lengths.append(len(tokens))
+            lengths.sort(reverse=True)
+
+    def find(self, title: str) -> Optional[str]:
+        """Primul brand cunoscut din titlu (None = niciunul)"""
+        tokens = tokenize(title)
+
+        for start, token in enumerate(tokens):
+            for length in self._lengths.get(token, ()):
+                brand = self._index.get(tokens[start:start + length])
+                if brand is not None:
+                    return brand
+
+        return None
+
+    def canonical(self, brand: Optional[str]) -> Optional[str]:
+        """Numele canonic pentru un brand scris oricum ("hewlett-packard" -> "HP")"""
+        if not brand:
+            return None
+        return self._index.get(tokenize(brand), brand)
+
+    def is_top(self, brand: Optional[str]) -> bool:
+        """Brand din topBrands (după forma canonică)"""
+        canonical = self.canonical(brand)
+        return canonical is not None and tokenize(canonical) in self._top
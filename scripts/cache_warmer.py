@@ -0,0 +1,189 @@
+"""
+AMDORO.RO - Cache Warmer
+Re-populează cache-ul API-ului (api/search_api.py) pentru cele mai cerute
+căutări, pagini de filtre și produse, după importuri sau periodic (cron)
+
+Frecvențele vin din jurnalul de cereri scris de API (sorted set pe zi).
+Cererile sunt trimise secvențial, cu rată limitată, și marcate cu
+X-Cache-Warmer (nu sunt numărate în jurnal).
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+from urllib.parse import quote
+
+import aiohttp
+import redis.asyncio as aioredis
+
+logger = logging.getLogger(__name__)
+
+# Aceeași cheie ca în api/search_api.py
+QUERY_LOG_KEY = 'cache:query_log'
+
+# Intrări citite din fiecare zi a jurnalului (înainte de agregare)
+QUERY_LOG_SCAN = 5000
+
+# Căutarea are path fix; filtrele și produsele sunt recunoscute după prefix
+# (un slug de produs poate începe cu "search")
+SEARCH_PATH = '/api/products/search'
+REQUEST_KINDS = {
+    'filters': '/api/filters/',
+    'products': '/api/products/',
+}
+
+# Câte cereri din fiecare tip sunt încălzite (default)
+DEFAULT_LIMITS = {'searches': 200, 'filters': 50, 'products': 500}
+
+
+def request_kind(path: str) -> str:
+    if path == SEARCH_PATH:
+        return 'searches'
+    for kind, prefix in REQUEST_KINDS.items():
+        if path.startswith(prefix):
+            return kind
+    return 'other'
+
+
+def query_string(params: Dict) -> str:
+    """Parametrii din jurnal ca query string (bool -> true/false, ca în FastAPI)"""
+    return '&'.join(
+        f"{quote(str(key))}={quote(str(value).lower() if isinstance(value, bool) else str(value))}"
+        for key, value in sorted(params.items())
+    )
+
+
+class CacheWarmer:
+    """
+    Încălzește cache-ul prin cereri HTTP către API
+
+    Trecând prin endpoint-uri, intrările ajung în cache exact sub cheile
+    folosite de traficul real (aceleași tag-uri de invalidare, aceleași TTL-uri).
+    """
+
+    def __init__(self, api_url: str, redis_url: str = 'redis://localhost:6379/0',
+                 rate: float = 5.0, days: int = 3, timeout: float = 30):
+        """
+        Args:
+            api_url: URL-ul de bază al API-ului (ex. http://localhost:8000)
+            rate: cereri pe secundă (maxim), ca încălzirea să nu concureze traficul real
+            days: zilele din jurnal adunate pentru clasament
+            timeout: timeout per cerere (secunde)
+        """
+        self.api_url = api_url.rstrip('/')
+        self.redis_client = aioredis.from_url(redis_url)
+        self.rate = rate
+        self.days = days
+        self.timeout = timeout
+
+    async def close(self):
+        await self.redis_client.aclose()
+
+    async def top_requests(self, limits: Dict[str, int]) -> List[Tuple[str, Dict, float]]:
+        """
+        Cele mai frecvente cereri per tip din ultimele `days` zile
+
+        Returns:
+            (path, params, frecvență), ordonate descrescător în cadrul fiecărui tip
+        """
+        totals = Counter()
+        today = datetime.utcnow()
+        for offset in range(self.days):
+            day_key = f"{QUERY_LOG_KEY}:{today - timedelta(days=offset):%Y%m%d}"
+            for member, score in await self.redis_client.zrevrange(day_key, 0, QUERY_LOG_SCAN - 1,
+                                                                   withscores=True):
+                totals[member] += score
+
+        selected = []
+        taken = Counter()
+        for member, score in totals.most_common():
+            request = json.loads(member)
+            kind = request_kind(request['path'])
+            if taken[kind] >= limits.get(kind, 0):
+                continue
+            taken[kind] += 1
+            selected.append((request['path'], request['params'], score))
+
+        return selected
+
+    async def warm(self, limits: Dict[str, int]) -> Dict:
+        """
+        Trimite cererile cele mai frecvente, una câte una, la cel mult `rate`/s
+
+        Returns:
+            Raport: cereri trimise / reușite / eșuate per tip, durata
+        """
+        requests = await self.top_requests(limits)
+        report = {kind: {'requested': 0, 'ok': 0, 'failed': 0} for kind in limits}
+        started = time.monotonic()
+        interval = 1.0 / self.rate if self.rate > 0 else 0
+
+        async with aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers={'X-Cache-Warmer': '1'}
+        ) as session:
+            for path, params, _ in requests:
+                request_started = time.monotonic()
+                stats = report.setdefault(request_kind(path), {'requested': 0, 'ok': 0, 'failed': 0})
+                stats['requested'] += 1
+
+                url = f"{self.api_url}{quote(path)}"
+                if params:
+                    url += f"?{query_string(params)}"
+                try:
+                    async with session.get(url) as response:
+                        await response.read()
+                        if response.status < 400 or response.status == 404:
+                            stats['ok'] += 1
+                        else:
+                            stats['failed'] += 1
+                            logger.warning(f"Warming {url} returned {response.status}")
+                except Exception as e:
+                    stats['failed'] += 1
+                    logger.warning(f"Warming {url} failed: {str(e)}")
+
+                # Rata limită: următoarea cerere pornește după `interval` de la precedenta
+                await asyncio.sleep(max(0.0, interval - (time.monotonic() - request_started)))
+
+        report['duration_s'] = round(time.monotonic() - started, 3)
+        logger.info(f"Cache warming done: {json.dumps(report)}")
+        return report
+
+
+async def run(args):
+    warmer = CacheWarmer(args.api_url, args.redis_url, rate=args.rate, days=args.days)
+    try:
+        if args.delay:
+            await asyncio.sleep(args.delay)
+        return await warmer.warm({
+            'searches': args.top_searches,
+            'filters': args.top_filters,
+            'products': args.top_products,
+        })
+    finally:
+        await warmer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Încălzește cache-ul API-ului de căutare')
+    parser.add_argument('--api-url', default='http://localhost:8000')
+    parser.add_argument('--redis-url', default='redis://localhost:6379/0')
+    parser.add_argument('--top-searches', type=int, default=DEFAULT_LIMITS['searches'])
+    parser.add_argument('--top-filters', type=int, default=DEFAULT_LIMITS['filters'])
+    parser.add_argument('--top-products', type=int, default=DEFAULT_LIMITS['products'])
+    parser.add_argument('--rate', type=float, default=5.0, help='cereri pe secundă')
+    parser.add_argument('--days', type=int, default=3, help='zile din jurnalul de cereri')
+    parser.add_argument('--delay', type=float, default=0, help='secunde de așteptat înainte de start')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+"""
+AMDORO.RO - Category Matcher
+Mapare categorii feed -> taxonomia Amdoro, compilată o singură dată per import
+(automat Aho-Corasick peste toate feedMappings + memoizare per categorie din feed)
+"""
+
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class PatternMatcher:
+    """Automat Aho-Corasick: găsește toate pattern-urile dintr-un text într-o singură trecere"""
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._outputs: List[List[Any]] = [[]]
+        self._built = True
+
+    def add(self, pattern: str, value: Any):
+        """Adaugă un pattern; `value` e returnat de find_all la fiecare apariție"""
+        node = 0
+        for char in pattern:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+                self._goto[node][char] = next_node
+            node = next_node
+
+        self._outputs[node].append(value)
+        self._built = False
+
+    def build(self):
+        """Calculează legăturile de eșec (BFS peste trie)"""
+        queue = deque(self._goto[0].values())
+
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._outputs[child] = self._outputs[child] + self._outputs[self._fail[child]]
+
+        self._built = True
+
+    def find_all(self, text: str) -> List[Any]:
+        """Valorile tuturor pattern-urilor care apar în text"""
+        if not self._built:
+            self.build()
+
+        node = 0
+        found = []
+        for char in text:
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            found.extend(self._outputs[node])
+
+        return found
+
+
+class CategoryMatcher:
+    """
+    Index compilat peste config/category-mapping.json
+
+    Păstrează ordinea de verificare din mapare: categoriile principale în ordinea
+    din config, fiecare urmată de subcategoriile ei. Pentru categoriile principale
+    se acceptă și potrivirea inversă (categoria din feed inclusă în mapare).
+    """
+
+    def __init__(self, category_mapping: Dict,
+                 category_ids: Optional[Dict[str, int]] = None,
+                 keywords: Optional[Dict[str, List[str]]] = None):
+        """
+        Args:
+            category_mapping: conținutul config/category-mapping.json
+            category_ids: slug -> id din tabela categories; dacă e dat, slug-urile
+                          care nu există în DB sunt ignorate (ca în map_category)
+            keywords: slug -> cuvinte cheie extra, verificate după feedMappings
+        """
+        self.category_mapping = category_mapping
+        self.category_ids = category_ids
+        self.keywords = keywords or {}
+
+        # slug -> slug-ul categoriei principale
+        self.root_slugs: Dict[str, str] = {}
+        for cat_slug, config in category_mapping['categoryMapping'].items():
+            self.root_slugs[cat_slug] = cat_slug
+            for subcat_slug in config.get('subcategories', {}):
+                self.root_slugs[subcat_slug] = cat_slug
+
+        self._compiled: Dict[str, Tuple[PatternMatcher, List[Tuple[str, int]], List[str]]] = {}
+        self._cache: Dict[Tuple[str, str], Optional[str]] = {}
+
+    def match(self, feed_category: str, feed_source: str) -> Optional[str]:
+        """Slug-ul categoriei Amdoro pentru o categorie din feed (None = fără potrivire)"""
+        key = (feed_source, feed_category)
+        if key in self._cache:
+            return self._cache[key]
+
+        normalized = (feed_category or '').lower().strip()
+        slug = None
+
+        if normalized:
+            matcher, reverse, slugs = self._compile(feed_source)
+            ranks = matcher.find_all(normalized)
+            ranks.extend(rank for mapping, rank in reverse if normalized in mapping)
+            if ranks:
+                slug = slugs[min(ranks)]
+
+        self._cache[key] = slug
+        return slug
+
+    def category_id(self, feed_category: str, feed_source: str) -> Optional[int]:
+        """category_id din DB pentru o categorie din feed (None = default)"""
+        slug = self.match(feed_category, feed_source)
+        if slug is None or self.category_ids is None:
+            return None
+        return self.category_ids.get(slug)
+
+    def _compile(self, feed_source: str):
+        """Construiește automatul pentru o sursă (o singură dată)"""
+        if feed_source in self._compiled:
+            return self._compiled[feed_source]
+
+        matcher = PatternMatcher()
+        reverse = []   # (mapare, rank) pentru potrivirea inversă pe categoriile principale
+        slugs = []     # rank -> slug; rank mai mic = verificat mai devreme
+
+        def add(slug: str, patterns: List[str], allow_reverse: bool):
+            if self.category_ids is not None and slug not in self.category_ids:
+                return
+            for pattern in patterns:
+                rank = len(slugs)
+                slugs.append(slug)
+                matcher.add(pattern.lower(), rank)
+                if allow_reverse:
+                    reverse.append((pattern.lower(), rank))
+
+        for cat_slug, config in self.category_mapping['categoryMapping'].items():
+            add(cat_slug, config.get('feedMappings', {}).get(feed_source, []), True)
+
+            for subcat_slug, subcat_config in config.get('subcategories', {}).items():
+                add(subcat_slug, subcat_config.get('feedMappings', {}).get(feed_source, []), False)
+
+        for slug, words in self.keywords.items():
+            add(slug, words, False)
+
+        matcher.build()
+        self._compiled[feed_source] = (matcher, reverse, slugs)
+        return self._compiled[feed_source]
@@ -0,0 +1,294 @@
+"""
+AMDORO.RO - Feed Fetch
+Download comun pentru feed-uri (FeedImporter + TwoPerformantSync):
+- cache pe disc cu ETag / Last-Modified (request-uri condiționale)
+- hash de conținut: un feed identic cu ultimul import nu mai e parsat
+- decompresie gzip în streaming (.csv.gz / .xml.gz)
+- fișiere temporare unice per rulare
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
+from email.message import Message
+from typing import AsyncIterator, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+# Dimensiunea bucăților citite din rețea / de pe disc
+FETCH_CHUNK_SIZE = 64 * 1024
+
+
+def content_charset(content_type: Optional[str]) -> Optional[str]:
+    """charset-ul din header-ul Content-Type (None = nedeclarat)"""
+    if not content_type:
+        return None
+    message = Message()
+    message['Content-Type'] = content_type
+    return message.get_content_charset()
+
+
+class GzipStreamDecoder:
+    """
+    Decomprimă gzip pe măsură ce sosesc datele
+
+    Feed-urile servite ca fișier .gz (fără Content-Encoding) sunt detectate
+    după primii 2 bytes; restul trec neschimbate. Suportă gzip multi-member.
+    """
+
+    def __init__(self):
+        self._head = b''
+        self._gzip: Optional[bool] = None
+        self._decompressor = None
+
+    def feed(self, chunk: bytes) -> bytes:
+        if self._gzip is None:
+            self._head += chunk
+            if len(self._head) < len(GZIP_MAGIC):
+                return b''
+            chunk, self._head = self._head, b''
+            self._gzip = chunk.startswith(GZIP_MAGIC)
+
+        if not self._gzip:
+            return chunk
+
+        output = []
+        while chunk:
+            if self._decompressor is None:
+                self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            output.append(self._decompressor.decompress(chunk))
+            if not self._decompressor.eof:
+                break
+            # Începe un nou membru gzip
+            chunk = self._decompressor.unused_data
+            self._decompressor = None
+
+        return b''.join(output)
+
+    def flush(self) -> bytes:
+        if self._gzip is None:
+            self._gzip = False
+            return self._head
+        if self._gzip and self._decompressor is not None:
+            return self._decompressor.flush()
+        return b''
+
+
+@dataclass
+class FetchResult:
+    """Rezultatul unui fetch"""
+    url: str
+    status: str                      # 'changed' | 'not_modified' (304) | 'unchanged' (același hash)
+    path: Optional[str]              # corpul decomprimat, pe disc
+    content_hash: Optional[str]
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    started_at: Optional[datetime] = None
+    imported_at: Optional[str] = None   # începutul ultimului import reușit (ISO, UTC)
+    charset: Optional[str] = None       # din Content-Type (None = nedeclarat)
+    temporary: bool = False             # path e un fișier temporar al rulării
+
+    @property
+    def changed(self) -> bool:
+        return self.status == 'changed'
+
+
+class FeedFetcher:
+    """
+    Descarcă feed-uri cu cache pe disc
+
+    Metadatele (ETag, Last-Modified, hash) sunt salvate doar la commit(), după
+    un import reușit - un import eșuat nu marchează feed-ul ca procesat.
+    Fiecare consumator are nevoie de propriul cache_dir: intrările sunt
+    indexate doar după URL, iar commit-ul unuia ar marca feed-ul ca procesat
+    și pentru celălalt.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = '.feed_cache'):
+        """
+        Args:
+            cache_dir: director pentru corpuri + metadate (separat per consumator); None = fără cache
+                       (doar fișiere temporare, feed-ul e considerat mereu schimbat)
+        """
+        self.cache_dir = cache_dir
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def cache_paths(self, url: str) -> tuple:
+        """(corp, metadate) pentru un URL"""
+        key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return (os.path.join(self.cache_dir, f"{key}.body"),
+                os.path.join(self.cache_dir, f"{key}.json"))
+
+    def load_meta(self, url: str) -> Dict:
+        if not self.cache_dir:
+            return {}
+        body_path, meta_path = self.cache_paths(url)
+        if not (os.path.exists(body_path) and os.path.exists(meta_path)):
+            return {}
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def request_headers(self, meta: Dict) -> Dict:
+        """Header-e condiționale + accept gzip"""
+        headers = {'Accept-Encoding': 'gzip'}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    async def fetch_async(self, url: str, timeout: int = 300) -> FetchResult:
+        """Fetch cu aiohttp (FeedImporter)"""
+        import aiohttp
+
+        meta = self.load_meta(url)
+        started_at = datetime.utcnow()
+
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=timeout)) as session:
+            async with session.get(url, headers=self.request_headers(meta)) as response:
+                if response.status == 304 and meta:
+                    return self.not_modified(url, meta, started_at)
+                response.raise_for_status()
+
+                spool = _Spool(self.cache_dir)
+                try:
+                    async for chunk in response.content.iter_chunked(FETCH_CHUNK_SIZE):
+                        await asyncio.to_thread(spool.write, chunk)
+                    spool.close()
+                except BaseException:
+                    spool.discard()
+                    raise
+
+                return self.finish(url, meta, spool, response.headers, started_at)
+
+    def fetch(self, url: str, timeout: int = 30) -> FetchResult:
+        """Fetch cu requests (TwoPerformantSync)"""
+        import requests
+
+        meta = self.load_meta(url)
+        started_at = datetime.utcnow()
+
+        with requests.get(url, headers=self.request_headers(meta), timeout=timeout, stream=True) as response:
+            if response.status_code == 304 and meta:
+                return self.not_modified(url, meta, started_at)
+            response.raise_for_status()
+
+            spool = _Spool(self.cache_dir)
+            try:
+                for chunk in response.iter_content(FETCH_CHUNK_SIZE):
+                    spool.write(chunk)
+                spool.close()
+            except BaseException:
+                spool.discard()
+                raise
+
+            return self.finish(url, meta, spool, response.headers, started_at)
+
+    def not_modified(self, url: str, meta: Dict, started_at: datetime) -> FetchResult:
+        body_path, _ = self.cache_paths(url)
+        logger.info(f"Feed not modified (304): {url}")
+        return FetchResult(
+            url=url, status='not_modified', path=body_path,
+            content_hash=meta.get('content_hash'), etag=meta.get('etag'),
+            last_modified=meta.get('last_modified'), started_at=started_at,
+            imported_at=meta.get('imported_at'), charset=meta.get('charset')
+        )
+
+    def finish(self, url: str, meta: Dict, spool: '_Spool', headers, started_at: datetime) -> FetchResult:
+        """Compară hash-ul descărcat cu ultimul import"""
+        result = FetchResult(
+            url=url, status='changed', path=spool.path, content_hash=spool.hexdigest(),
+            etag=headers.get('ETag'), last_modified=headers.get('Last-Modified'),
+            started_at=started_at, imported_at=meta.get('imported_at'),
+            charset=content_charset(headers.get('Content-Type')), temporary=True
+        )
+
+        if meta and meta.get('content_hash') == result.content_hash:
+            spool.discard()
+            result.status = 'unchanged'
+            result.path, _ = self.cache_paths(url)
+            result.temporary = False
+            logger.info(f"Feed content unchanged ({result.content_hash[:12]}): {url}")
+
+        return result
+
+    def commit(self, result: FetchResult):
+        """Marchează feed-ul ca importat: corpul devine cache, metadatele se salvează"""
+        if not self.cache_dir:
+            self.discard(result)
+            return
+
+        body_path, meta_path = self.cache_paths(result.url)
+        if result.temporary:
+            os.replace(result.path, body_path)
+            result.path = body_path
+            result.temporary = False
+
+        meta = {
+            'url': result.url,
+            'etag': result.etag,
+            'last_modified': result.last_modified,
+            'content_hash': result.content_hash,
+            'imported_at': result.started_at.isoformat() if result.started_at else None,
+            'charset': result.charset,
+        }
+        temp_meta = f"{meta_path}.{os.getpid()}.tmp"
+        with open(temp_meta, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(temp_meta, meta_path)
+
+    def discard(self, result: FetchResult):
+        """Șterge fișierul temporar al unui fetch neimportat"""
+        if result.temporary and result.path and os.path.exists(result.path):
+            os.remove(result.path)
+        result.temporary = False
+
+    @staticmethod
+    async def iter_file_chunks(path: str) -> AsyncIterator[bytes]:
+        """Citește un corp descărcat în bucăți, fără a bloca event loop-ul"""
+        with open(path, 'rb') as f:
+            while True:
+                chunk = await asyncio.to_thread(f.read, FETCH_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+
+
+class _Spool:
+    """Fișier temporar unic per rulare: decomprimă + calculează hash în timpul scrierii"""
+
+    def __init__(self, directory: Optional[str]):
+        handle, self.path = tempfile.mkstemp(prefix='feed-', suffix='.part', dir=directory)
+        self._file = os.fdopen(handle, 'wb')
+        self._decoder = GzipStreamDecoder()
+        self._hash = hashlib.sha256()
+
+    def write(self, chunk: bytes):
+        self._append(self._decoder.feed(chunk))
+
+    def close(self):
+        self._append(self._decoder.flush())
+        self._file.close()
+
+    def discard(self):
+        if not self._file.closed:
+            self._file.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+    def _append(self, data: bytes):
+        if data:
+            self._hash.update(data)
+            self._file.write(data)
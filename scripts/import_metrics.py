@@ -0,0 +1,193 @@
+"""
+AMDORO.RO - Import Metrics
+Instrumentare pentru FeedImporter: timp wall/CPU per etapă, rânduri/s,
+latența commit-urilor (p50/p95), număr de round-trip-uri DB, RSS maxim.
+Raport JSON per rulare + export în format text Prometheus.
+"""
+
+import math
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import AsyncIterator, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def percentile(samples: List[float], pct: float) -> Optional[float]:
+    """Percentila prin metoda nearest-rank (None pentru listă goală)"""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def peak_rss_mb(who: int) -> Optional[float]:
+    """RSS maxim (MB) pentru RUSAGE_SELF / RUSAGE_CHILDREN"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(who).ru_maxrss
+    # Linux raportează KB, macOS bytes
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return round(peak / divisor, 1)
+
+
+class ImportMetrics:
+    """
+    Colector de metrici pentru o rulare de import
+
+    CPU-ul e măsurat cu time.thread_time(): exact pentru etapele sincrone
+    (normalizare, mapare categorii); pentru etapele async (parse, scriere DB)
+    include și munca altor task-uri de pe event loop rulate între timp.
+    Etapele din procesele worker sunt adunate peste toate procesele.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Pornește o rulare nouă"""
+        self.started_at = datetime.utcnow()
+        self._started = time.perf_counter()
+        # etapă -> [wall_s, cpu_s, apeluri]
+        self.stages: Dict[str, List[float]] = defaultdict(lambda: [0.0, 0.0, 0])
+        self.counters: Dict[str, int] = defaultdict(int)
+        # nume -> durate (secunde)
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+
+    @contextmanager
+    def stage(self, name: str):
+        """Măsoară un bloc de cod (poate conține await) ca parte a unei etape"""
+        wall = time.perf_counter()
+        cpu = time.thread_time()
+        try:
+            yield
+        finally:
+            self.add_stage(name, time.perf_counter() - wall, time.thread_time() - cpu)
+
+    @contextmanager
+    def latency(self, name: str):
+        """Înregistrează durata unui bloc ca eșantion pentru percentile"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.latencies[name].append(time.perf_counter() - started)
+
+    def add_stage(self, name: str, wall: float, cpu: float, calls: int = 1):
+        totals = self.stages[name]
+        totals[0] += wall
+        totals[1] += cpu
+        totals[2] += calls
+
+    def merge_stages(self, stages: Dict[str, List[float]]):
+        """Adaugă etapele măsurate în alt proces (vezi take_stages)"""
+        for name, (wall, cpu, calls) in stages.items():
+            self.add_stage(name, wall, cpu, calls)
+
+    def take_stages(self) -> Dict[str, List[float]]:
+        """Etapele acumulate de la ultimul apel (pentru procesele worker)"""
+        stages = dict(self.stages)
+        self.stages.clear()
+        return stages
+
+    def count(self, name: str, value: int = 1):
+        self.counters[name] += value
+
+    async def timed_iter(self, name: str, iterator: AsyncIterator) -> AsyncIterator:
+        """Atribuie etapei `name` timpul petrecut în producerea fiecărui element"""
+        try:
+            while True:
+                with self.stage(name):
+                    try:
+                        item = await iterator.__anext__()
+                    except StopAsyncIteration:
+                        return
+                yield item
+        finally:
+            if hasattr(iterator, 'aclose'):
+                await iterator.aclose()
+
+    def attach_engine(self, engine):
+        """Numără statement-urile trimise prin engine (AsyncEngine sau Engine)"""
+        from sqlalchemy import event
+
+        def count_statement(conn, cursor, statement, parameters, context, executemany):
+            self.counters['db_round_trips'] += 1
+
+        event.listen(getattr(engine, 'sync_engine', engine), 'before_cursor_execute', count_statement)
+
+    def report(self) -> Dict:
+        """Raportul rulării (serializabil JSON)"""
+        duration = time.perf_counter() - self._started
+        rows = self.counters.get('rows', 0)
+
+        return {
+            'started_at': self.started_at.isoformat(),
+            'duration_s': round(duration, 3),
+            'rows': rows,
+            'rows_per_s': round(rows / duration, 1) if duration > 0 else None,
+            'stages': {
+                name: {
+                    'wall_s': round(wall, 3),
+                    'cpu_s': round(cpu, 3),
+                    'calls': int(calls),
+                }
+                for name, (wall, cpu, calls) in sorted(self.stages.items())
+            },
+            'latency_ms': {
+                name: {
+                    'count': len(samples),
+                    'p50': round(percentile(samples, 50) * 1000, 1),
+                    'p95': round(percentile(samples, 95) * 1000, 1),
+                    'max': round(max(samples) * 1000, 1),
+                }
+                for name, samples in sorted(self.latencies.items()) if samples
+            },
+            'counters': dict(sorted(self.counters.items())),
+            'peak_rss_mb': peak_rss_mb(resource.RUSAGE_SELF) if resource else None,
+            'peak_rss_children_mb': peak_rss_mb(resource.RUSAGE_CHILDREN) if resource else None,
+        }
+
+    def to_prometheus(self, prefix: str = 'amdoro_import') -> str:
+        """Raportul în format text Prometheus (ex. pentru textfile collector)"""
+        report = self.report()
+        lines = []
+
+        def metric(name: str, kind: str, help_text: str, samples: List[tuple]):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for labels, value in samples:
+                if value is None:
+                    continue
+                label_text = ','.join(f'{key}="{val}"' for key, val in labels.items())
+                lines.append(f"{prefix}_{name}{{{label_text}}} {value}" if label_text
+                             else f"{prefix}_{name} {value}")
+
+        metric('duration_seconds', 'gauge', 'Durata rulării de import',
+               [({}, report['duration_s'])])
+        metric('rows_total', 'gauge', 'Rânduri procesate în rulare',
+               [({}, report['rows'])])
+        metric('rows_per_second', 'gauge', 'Throughput-ul rulării',
+               [({}, report['rows_per_s'])])
+        metric('stage_wall_seconds', 'gauge', 'Timp wall per etapă',
+               [({'stage': name}, stage['wall_s']) for name, stage in report['stages'].items()])
+        metric('stage_cpu_seconds', 'gauge', 'Timp CPU per etapă',
+               [({'stage': name}, stage['cpu_s']) for name, stage in report['stages'].items()])
+        metric('latency_milliseconds', 'gauge', 'Percentile de latență',
+               [({'name': name, 'quantile': quantile}, values[key])
+                for name, values in report['latency_ms'].items()
+                for quantile, key in (('0.5', 'p50'), ('0.95', 'p95'), ('1', 'max'))])
+        metric('counter', 'gauge', 'Contoare ale rulării (round-trip-uri DB, erori, ...)',
+               [({'name': name}, value) for name, value in report['counters'].items()])
+        metric('peak_rss_megabytes', 'gauge', 'RSS maxim',
+               [({'process': 'main'}, report['peak_rss_mb']),
+                ({'process': 'workers'}, report['peak_rss_children_mb'])])
+
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,155 @@
+"""
+AMDORO.RO - Import Scheduler
+Rulează feed-urile concurent (limită globală + limită per rețea afiliată)
+și produce un raport consolidat per feed
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FeedSpec:
+    """Un feed de importat"""
+    source: str                 # rețeaua: 'profitshare', '2performant', 'amazon'
+    url: str
+    format: str = 'csv'         # 'csv' | 'xml'
+    priority: int = 5           # mai mare = pornește mai devreme
+    name: Optional[str] = None  # eticheta din raport (default: source)
+    batch_size: int = 1000
+
+    @property
+    def label(self) -> str:
+        return self.name or self.source
+
+
+class ImportScheduler:
+    """
+    Planificator pentru importul mai multor feed-uri pe același FeedImporter
+
+    Feed-urile pornesc în ordinea priorității. Un feed ocupă întâi un slot al
+    rețelei lui și abia apoi un slot global, ca un feed blocat de limita
+    rețelei să nu țină ocupat un slot global. Back-pressure-ul către DB vine
+    din FeedImporter.db_writer_slots, comun tuturor feed-urilor.
+    """
+
+    def __init__(self, importer, max_concurrent_feeds: int = 4, per_network_limit: int = 1,
+                 network_limits: Optional[Dict[str, int]] = None):
+        """
+        Args:
+            importer: FeedImporter folosit de toate feed-urile
+            max_concurrent_feeds: feed-uri importate simultan în total
+            per_network_limit: feed-uri simultane per rețea (default)
+            network_limits: excepții per rețea, ex. {'amazon': 2}
+        """
+        self.importer = importer
+        self.max_concurrent_feeds = max_concurrent_feeds
+        self.per_network_limit = per_network_limit
+        self.network_limits = network_limits or {}
+
+    async def run(self, feeds: List[FeedSpec]) -> Dict:
+        """Importă toate feed-urile și întoarce raportul consolidat"""
+        global_slots = asyncio.Semaphore(self.max_concurrent_feeds)
+        network_slots = {
+            source: asyncio.Semaphore(self.network_limits.get(source, self.per_network_limit))
+            for source in {feed.source for feed in feeds}
+        }
+
+        ordered = sorted(feeds, key=lambda feed: -feed.priority)
+        started_at = datetime.utcnow()
+        started = time.monotonic()
+
+        # Cu merge din staging, o sursă cu mai multe feed-uri e marcată (sweep)
+        # o singură dată, după toate feed-urile ei - altfel fiecare feed ar marca
+        # produsele celorlalte ca dispărute
+        shared_sources = set()
+        if self.importer.staged_merge:
+            sources = [feed.source for feed in feeds]
+            shared_sources = {source for source in sources if sources.count(source) > 1}
+
+        await self.importer.begin_run(deferred_sweep_sources=shared_sources)
+        try:
+            results = await asyncio.gather(*(
+                self.run_feed(feed, global_slots, network_slots[feed.source])
+                for feed in ordered
+            ))
+            swept = await self.sweep_shared_sources(shared_sources, results, started_at)
+        finally:
+            self.importer.end_run()
+        # Un singur refresh al view-ului de căutare pentru toate feed-urile rulării
+        view_refresh_s = await self.importer.refresh_search_view()
+
+        report = {
+            'started_at': started_at.isoformat(),
+            'duration_s': round(time.monotonic() - started, 3),
+            'feeds': results,
+            'totals': {
+                key: sum(result.get(key, 0) for result in results)
+                for key in ('imported', 'updated', 'unchanged', 'errors')
+            },
+            'failed_feeds': [result['feed'] for result in results if result['status'] != 'ok'],
+        }
+        if swept:
+            report['marked_out_of_stock'] = swept
+        report['search_view_refresh_s'] = view_refresh_s
+        report['metrics'] = self.importer.metrics.report()
+
+        for result in results:
+            logger.info(f"[{result['feed']}] {result['status']} in {result['duration_s']}s "
+                        f"(queued {result['queued_s']}s): {result.get('imported', 0)} new, "
+                        f"{result.get('updated', 0)} changed, {result.get('unchanged', 0)} unchanged, "
+                        f"{result.get('errors', 0)} errors")
+
+        return report
+
+    async def sweep_shared_sources(self, sources, results: List[Dict], since: datetime) -> Dict[str, int]:
+        """Sweep-ul amânat, doar pentru sursele la care toate feed-urile au reușit"""
+        swept = {}
+        for source in sorted(sources):
+            source_results = [result for result in results if result['source'] == source]
+            if any(result['status'] != 'ok' for result in source_results):
+                logger.warning(f"Skipping out-of-stock sweep for {source}: not all feeds imported")
+                continue
+            try:
+                swept[source] = await self.importer.sweep_source(source, since)
+            except Exception as e:
+                logger.error(f"Out-of-stock sweep failed for {source}: {str(e)}")
+        return swept
+
+    async def run_feed(self, feed: FeedSpec, global_slots: asyncio.Semaphore,
+                       network_slot: asyncio.Semaphore) -> Dict:
+        """Importă un feed când există slot liber pe rețea și global"""
+        queued = time.monotonic()
+
+        async with network_slot:
+            async with global_slots:
+                started = time.monotonic()
+                result = {
+                    'feed': feed.label,
+                    'source': feed.source,
+                    'format': feed.format,
+                    'priority': feed.priority,
+                    'queued_s': round(started - queued, 3),
+                }
+
+                try:
+                    if feed.format == 'xml':
+                        stats = await self.importer.import_from_xml(feed.url, feed.source, feed.batch_size)
+                    else:
+                        stats = await self.importer.import_from_csv(feed.url, feed.source, feed.batch_size)
+                    result.update(stats)
+                    result['status'] = 'ok'
+
+                except Exception as e:
+                    logger.error(f"[{feed.label}] Import failed: {str(e)}")
+                    result['status'] = 'failed'
+                    result['error'] = str(e)
+
+                result['duration_s'] = round(time.monotonic() - started, 3)
+                return result
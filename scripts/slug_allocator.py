@@ -0,0 +1,86 @@
+"""
+AMDORO.RO - Slug Allocator
+Slug-uri unice pentru produse noi, alocate pe tot batch-ul
+(fără retry per rând la încălcarea UNIQUE pe products.slug)
+"""
+
+import hashlib
+from typing import Dict, Iterable, List
+
+# Lungimea maximă a slug-ului (config/stock-management.json -> urlStructure)
+MAX_SLUG_LENGTH = 100
+
+# Caractere hex din hash-ul feed id-ului folosite ca sufix
+HASH_SUFFIX_LENGTH = 6
+
+
+class SlugAllocator:
+    """
+    Alocă slug-uri deterministe pentru produsele noi
+
+    Ordinea candidaților: slug-ul de bază (brand + titlu), apoi bază + hash scurt
+    din (feed_source, feed_product_id), apoi bază + hash + -2, -3, ... Același
+    produs primește mereu același sufix, indiferent de ordinea din feed.
+    Produsele existente nu trec prin alocator - își păstrează slug-ul din DB.
+    """
+
+    def __init__(self, max_length: int = MAX_SLUG_LENGTH):
+        self.max_length = max_length
+        self.taken = set()
+        # (feed_source, feed_product_id) -> slug alocat (aparițiile repetate primesc același slug)
+        self.assigned: Dict[tuple, str] = {}
+
+    def mark_taken(self, slugs: Iterable[str]):
+        """Slug-uri deja folosite (din DB sau alocate anterior)"""
+        self.taken.update(slugs)
+
+    def base(self, product: Dict) -> str:
+        return product['slug'] or 'produs'
+
+    def suffix(self, product: Dict) -> str:
+        key = f"{product['feed_source']}:{product['feed_product_id']}"
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()[:HASH_SUFFIX_LENGTH]
+
+    def with_suffix(self, base: str, suffix: str) -> str:
+        """Bază trunchiată astfel încât slug-ul cu sufix să rămână <= max_length"""
+        return f"{base[:self.max_length - len(suffix) - 1].rstrip('-')}-{suffix}"
+
+    def candidates(self, product: Dict, attempt: int = 0) -> List[str]:
+        """Candidații unui produs pentru runda `attempt` (0 = bază + hash)"""
+        base = self.base(product)
+        hashed = self.with_suffix(base, self.suffix(product))
+        if attempt == 0:
+            return [base[:self.max_length], hashed]
+        return [self.with_suffix(hashed, str(attempt + 1))]
+
+    def pending(self, products: List[Dict]) -> List[Dict]:
+        """Produsele care nu au primit încă slug în alocatorul curent"""
+        return [
+            product for product in products
+            if (product['feed_source'], product['feed_product_id']) not in self.assigned
+        ]
+
+    def assign(self, products: List[Dict], attempt: int = 0) -> List[Dict]:
+        """
+        Atribuie primul candidat liber fiecărui produs (în ordinea din batch)
+
+        Returns:
+            Produsele fără candidat liber în această rundă
+        """
+        unresolved = []
+
+        for product in products:
+            key = (product['feed_source'], product['feed_product_id'])
+            if key in self.assigned:
+                product['slug'] = self.assigned[key]
+                continue
+
+            for slug in self.candidates(product, attempt):
+                if slug not in self.taken:
+                    self.taken.add(slug)
+                    self.assigned[key] = product['slug'] = slug
+                    break
+            else:
+                unresolved.append(product)
+
+        return unresolved
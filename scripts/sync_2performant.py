@@ -12,15 +12,33 @@ python scripts/sync_2performant.py
 import os
 import json
 import csv
-import requests
 import xmltodict
 from datetime import datetime
 from dotenv import load_dotenv
 from urllib.parse import quote
 
+from category_matcher import CategoryMatcher
+from feed_fetch import FeedFetcher
+
 # Load environment variables
 load_dotenv('.env.local')
 
+# Categoriile site-ului (data/products.json) per categorie principală Amdoro
+CATEGORY_LABELS = {
+    'electronice-it': 'Electronics',
+    'moda-imbracaminte': 'Fashion',
+    'casa-gradina': 'Home',
+    'electrocasnice': 'Home',
+}
+
+# Cuvinte cheie verificate după feedMappings din config
+CATEGORY_KEYWORDS = {
+    'electronice-it': ['electronic', 'telefon', 'laptop', 'gadget', 'calculator', 'tv'],
+    'moda-imbracaminte': ['fashion', 'imbracaminte', 'incaltaminte', 'haine', 'pantofi', 'bluza'],
+    'casa-gradina': ['home', 'casa', 'bucatarie', 'mobilier', 'decoratiuni'],
+    'electrocasnice': ['electrocasnice'],
+}
+
 class TwoPerformantSync:
     def __init__(self):
         self.api_key = os.getenv('NEXT_PUBLIC_2PERFORMANT_API_KEY')
@@ -29,6 +47,15 @@ class TwoPerformantSync:
         
         if not all([self.api_key, self.aff_code]):
             raise ValueError("Missing 2Performant credentials in .env.local")
+        
+        # Același matcher compilat ca în feed_importer.py (mapări din config + keywords)
+        with open('config/category-mapping.json', 'r', encoding='utf-8') as f:
+            category_mapping = json.load(f)
+        self.category_matcher = CategoryMatcher(category_mapping, keywords=CATEGORY_KEYWORDS)
+        
+        # Download condiționat (ETag/Last-Modified) + cache pe disc, comun cu feed_importer.py
+        self.fetcher = FeedFetcher(cache_dir='.feed_cache/sync_2performant')
+        self.output_file = 'data/products.json'
     
     def generate_affiliate_link(self, product_url):
         """Generate 2Performant tracking link"""
@@ -39,29 +66,16 @@ class TwoPerformantSync:
     
     def categorize_product(self, category):
         """Map 2Performant categories to our categories"""
-        category_lower = category.lower()
-        
-        electronics_keywords = ['electronic', 'telefon', 'laptop', 'gadget', 'calculator', 'tv']
-        fashion_keywords = ['fashion', 'imbracaminte', 'incaltaminte', 'haine', 'pantofi', 'bluza']
-        home_keywords = ['home', 'casa', 'bucatarie', 'mobilier', 'decoratiuni', 'electrocasnice']
-        
-        if any(keyword in category_lower for keyword in electronics_keywords):
-            return 'Electronics'
-        elif any(keyword in category_lower for keyword in fashion_keywords):
-            return 'Fashion'
-        elif any(keyword in category_lower for keyword in home_keywords):
-            return 'Home'
-        else:
+        slug = self.category_matcher.match(category, '2performant')
+        
+        if slug is None:
             return 'Other'
+        return CATEGORY_LABELS.get(self.category_matcher.root_slugs[slug], 'Other')
     
-    def parse_xml_feed(self, feed_url):
-        """Parse XML product feed"""
-        print(f"📥 Downloading XML feed from: {feed_url}")
-        
-        response = requests.get(feed_url, timeout=30)
-        response.raise_for_status()
-        
-        data = xmltodict.parse(response.content)
+    def parse_xml_feed(self, feed_path):
+        """Parse XML product feed (downloaded by FeedFetcher)"""
+        with open(feed_path, 'rb') as f:
+            data = xmltodict.parse(f)
         products = []
         
         # Adjust based on actual XML structure
@@ -93,20 +107,11 @@ class TwoPerformantSync:
         
         return products
     
-    def parse_csv_feed(self, feed_url):
-        """Parse CSV product feed"""
-        print(f"📥 Downloading CSV feed from: {feed_url}")
-        
-        response = requests.get(feed_url, timeout=30)
-        response.raise_for_status()
-        
-        # Save temporarily
-        with open('temp_feed.csv', 'wb') as f:
-            f.write(response.content)
-        
+    def parse_csv_feed(self, feed_path):
+        """Parse CSV product feed (downloaded by FeedFetcher)"""
         products = []
         
-        with open('temp_feed.csv', 'r', encoding='utf-8') as csvfile:
+        with open(feed_path, 'r', encoding='utf-8-sig', newline='') as csvfile:
             reader = csv.DictReader(csvfile)
             
             for index, row in enumerate(reader, 1):
@@ -130,9 +135,6 @@ class TwoPerformantSync:
                     print(f"⚠️  Warning: Could not parse product {index}: {e}")
                     continue
         
-        # Cleanup
-        os.remove('temp_feed.csv')
-        
         return products
     
     def save_products(self, products, output_file='data/products.json'):
@@ -150,16 +152,26 @@ class TwoPerformantSync:
         print(f"Feed URL: {feed_url}")
         print(f"Feed Type: {feed_type.upper()}\n")
         
+        fetch = None
+        
         try:
+            print(f"📥 Downloading {feed_type.upper()} feed from: {feed_url}")
+            fetch = self.fetcher.fetch(feed_url)
+            
+            if not fetch.changed:
+                print(f"\n✅ Feed unchanged ({fetch.status}) - {self.output_file} is up to date")
+                return True
+            
             if feed_type.lower() == 'xml':
-                products = self.parse_xml_feed(feed_url)
+                products = self.parse_xml_feed(fetch.path)
             else:
-                products = self.parse_csv_feed(feed_url)
+                products = self.parse_csv_feed(fetch.path)
             
             # Filter out products without images or invalid prices
             products = [p for p in products if p['imageURL'] and p['price'] > 0]
             
-            self.save_products(products)
+            self.save_products(products, self.output_file)
+            self.fetcher.commit(fetch)
             
             print(f"\n📊 Sync Statistics:")
             print(f"   Total products: {len(products)}")
@@ -173,6 +185,11 @@ class TwoPerformantSync:
         except Exception as e:
             print(f"\n❌ Sync failed: {e}")
             return False
+        
+        finally:
+            # Fișierul temporar al unei rulări eșuate nu rămâne pe disc
+            if fetch is not None:
+                self.fetcher.discard(fetch)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,13 @@
+"""
+Testele rulează din rădăcina repo-ului (config/ e citit cu path relativ);
+scripts/ și api/ sunt importate ca module plate, ca în producție
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+for directory in ('scripts', 'api'):
+    sys.path.insert(0, os.path.join(ROOT, directory))
+os.chdir(ROOT)
@@ -0,0 +1,80 @@
+"""Teste pentru cursorul de paginare din api/search_api.py"""
+
+import base64
+import json
+from datetime import datetime
+
+import pytest
+
+from search_api import decode_cursor, encode_cursor, search_sort_keys
+
+
+def raw_cursor(payload) -> str:
+    """Cursor construit direct din JSON (inclusiv forme pe care encode_cursor nu le produce)"""
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+
+
+def decode(cursor: str, sort: str, q=None) -> list:
+    return decode_cursor(cursor, sort, search_sort_keys(sort, q)[1])
+
+
+def test_round_trip():
+    created = datetime(2024, 5, 1, 12, 30)
+    assert decode(encode_cursor('newest', (created, 42)), 'newest') == [created, 42]
+    assert decode(encode_cursor('price-asc', (19900, 7)), 'price-asc') == [19900, 7]
+    assert decode(encode_cursor('relevant', (0.25, 10, 3)), 'relevant', q='laptop') == [0.25, 10, 3]
+
+
+def test_sort_mismatch():
+    with pytest.raises(ValueError, match='does not match'):
+        decode(encode_cursor('price-asc', (100, 1)), 'newest')
+
+
+@pytest.mark.parametrize('sort, cursor', [
+    ('price-asc', 'not-base64!'),
+    ('price-asc', raw_cursor(['price-asc', 5])),              # valorile nu sunt o listă
+    ('price-asc', raw_cursor(['price-asc', [100]])),          # lipsește id-ul
+    ('newest', raw_cursor(['newest', [None, 1]])),            # cheie null
+    ('newest', raw_cursor(['newest', ['yesterday', 1]])),     # dată invalidă
+    ('price-asc', raw_cursor(['price-asc', ['100', 1]])),     # tip greșit
+    ('price-asc', raw_cursor(['price-asc', [True, 1]])),      # bool nu e întreg
+])
+def test_malformed_cursor(sort, cursor):
+    with pytest.raises(ValueError, match='Invalid cursor'):
+        decode(cursor, sort)
+
+
+def test_float_overflow_is_rejected():
+    # 1e400 e parsat de json ca inf; int(inf) ar da OverflowError
+    cursor = base64.urlsafe_b64encode(b'["price-asc", [1e400, 1]]').decode()
+    with pytest.raises(ValueError, match='Invalid cursor'):
+        decode(cursor, 'price-asc')
+    cursor = base64.urlsafe_b64encode(b'["relevant", [1e400, 1, 1]]').decode()
+    with pytest.raises(ValueError, match='Invalid cursor'):
+        decode(cursor, 'relevant', q='laptop')
+
+
+@pytest.mark.parametrize('sort, values', [
+    ('price-asc', [2 ** 31, 1]),          # price_cents e INTEGER
+    ('price-asc', [-2 ** 31 - 1, 1]),
+    ('price-asc', [100, 2 ** 63]),        # id e BIGINT
+    ('popular', [1, 2 ** 31, 1]),
+])
+def test_integer_out_of_column_range(sort, values):
+    with pytest.raises(ValueError, match='Invalid cursor'):
+        decode(raw_cursor([sort, values]), sort)
+
+
+def test_integer_at_column_limits():
+    assert decode(raw_cursor(['price-asc', [2 ** 31 - 1, 2 ** 63 - 1]]), 'price-asc') == [2 ** 31 - 1, 2 ** 63 - 1]
+
+
+def test_real_out_of_range():
+    with pytest.raises(ValueError, match='Invalid cursor'):
+        decode(raw_cursor(['relevant', [1e39, 1, 1]]), 'relevant', q='laptop')
+
+
+def test_aware_timestamp_is_rejected():
+    # created_at e TIMESTAMP fără fus orar
+    with pytest.raises(ValueError, match='Invalid cursor'):
+        decode(raw_cursor(['newest', ['2024-05-01T12:30:00+02:00', 1]]), 'newest')